@@ -5,16 +5,57 @@
 """
 
 import os
-import json
 import time
 from enum import Enum
-from typing import List, Dict, Any, Optional, Callable, Union
+from functools import lru_cache
+from typing import List, Optional, Callable, Union
 from dataclasses import dataclass
 from loguru import logger
 from agentica import Agent, OpenAIChat
 
 from codev.config import AppConfig
-from codev.tools import ShellTool, FileTool
+from codev.models import get_openai_client
+from codev.tools import ShellTool, FileTool, MAX_OUTPUT_LINES
+
+
+BASE_SYSTEM_PROMPT = "You are a powerful coding assistant that helps users with programming tasks."
+
+
+@lru_cache(maxsize=8)
+def build_system_prompt(approval_policy: Optional[str] = None) -> str:
+    """
+    Build the system prompt for an approval policy, cached so identical prompts are reused
+
+    Args:
+        approval_policy: The current approval policy
+
+    Returns:
+        The system prompt
+    """
+    if not approval_policy:
+        return BASE_SYSTEM_PROMPT
+    return f"{BASE_SYSTEM_PROMPT} The current approval policy is set to '{approval_policy}'."
+
+
+class PooledOpenAIChat(OpenAIChat):
+    """
+    OpenAIChat whose sync client sends requests over the shared pooled HTTP client
+
+    The client is built on first use, so a missing API key only fails the first request.
+    model.http_client stays unset, async runs (e.g. /compact) get an AsyncOpenAI client
+    with its own httpx.AsyncClient.
+    """
+
+    def get_client(self):
+        """
+        Get the sync OpenAI client, built on the first call
+
+        Returns:
+            openai.OpenAI instance
+        """
+        if self.client is None:
+            self.client = get_openai_client(**self.get_client_params())
+        return self.client
 
 
 class ReviewDecision(Enum):
@@ -54,6 +95,7 @@ class CodevAgent:
             history_manager=None,
             instructions: Union[List[str], str, None] = None,
             debug: bool = False,
+            full_stdout: bool = False,
     ):
         """
         Initialize the agent
@@ -65,12 +107,14 @@ class CodevAgent:
             history_manager: Manager for conversation history
             instructions: Instructions for the agent
             debug: Enable debug mode
+            full_stdout: Show full command output instead of its head and tail
         """
         self.config = config
         self.model = config.model  # Store model from config for easy access
-        self.approval_policy = approval_policy
+        self._approval_policy = approval_policy
         self.get_command_confirmation = get_command_confirmation
         self.history_manager = history_manager
+        self.full_stdout = full_stdout
 
         # Initialize state variables
         self.is_running = False
@@ -84,21 +128,57 @@ class CodevAgent:
         self.file_tool = self._create_custom_file_tool()
 
         # Create system message with instructions
-        system_message = "You are a powerful coding assistant that helps users with programming tasks."
-        if self.approval_policy:
-            system_message += f" The current approval policy is set to '{self.approval_policy}'."
+        system_message = build_system_prompt(self.approval_policy)
 
         self.agent = Agent(
-            model=OpenAIChat(id=self.config.model),
+            model=PooledOpenAIChat(id=self.config.model, max_tokens=self.config.max_tokens),
             system_prompt=system_message,
             instructions=instructions,
             add_history_to_messages=True,
+            num_history_responses=self.config.num_history_responses,
             tools=[self.shell_tool.execute_command, self.file_tool.write, self.file_tool.read, self.file_tool.delete],
             show_tool_calls=debug,
             debug=debug,
         )
-        # Initialize conversation history
-        self.conversation_history = self.agent.memory.messages
+
+    @property
+    def approval_policy(self) -> str:
+        """The current approval policy"""
+        return self._approval_policy
+
+    @approval_policy.setter
+    def approval_policy(self, approval_policy: str):
+        """
+        Set the approval policy, updating the system prompt only when the policy changes
+
+        The system prompt is otherwise left untouched, so the prompt prefix stays
+        identical between turns and can be served from the provider's prompt cache.
+
+        Args:
+            approval_policy: The new approval policy
+        """
+        if approval_policy == self._approval_policy:
+            return
+        self._approval_policy = approval_policy
+        self.agent.system_prompt = build_system_prompt(approval_policy)
+
+    @property
+    def conversation_history(self):
+        """Messages of the conversation, kept in the agent memory"""
+        return self.agent.memory.messages
+
+    def compact_history(self, summary: str):
+        """
+        Replace the conversation history with a summary
+
+        The summary is sent after the system prompt on every following turn, so the
+        prompt prefix stays identical between turns.
+
+        Args:
+            summary: Summary of the conversation so far
+        """
+        self.agent.memory.clear()
+        self.agent.add_messages = [{"role": "user", "content": f"Conversation summary: {summary}"}]
 
     def _create_custom_shell_tool(self):
         """
@@ -107,7 +187,7 @@ class CodevAgent:
         Returns:
             ShellTool instance
         """
-        shell_tool = ShellTool()
+        shell_tool = ShellTool(max_output_lines=None if self.full_stdout else MAX_OUTPUT_LINES)
 
         # Wrap the execute_command method to handle approval
         original_execute_command = shell_tool.execute_command
@@ -123,31 +203,14 @@ class CodevAgent:
             Returns:
                 Command execution result
             """
-            logger.debug(f"Executing command: {command} (background: {is_background})")
+            logger.debug("Executing command: {} (background: {})", command, is_background)
 
             # Check if we need to confirm
             if self.approval_policy != "full-auto" and self.get_command_confirmation:
-                try:
-                    # Convert command to list if it's a string
-                    cmd_list = command if isinstance(command, list) else command.split()
-
-                    # For synchronous operation, we need to handle the confirmation differently
-                    if hasattr(self.get_command_confirmation, "__call__"):
-                        confirmation = self.get_command_confirmation(cmd_list, None)
-                    else:
-                        # If the confirmation function is async, we can't call it directly
-                        confirmation = CommandConfirmation(review=ReviewDecision.APPROVE)
-
-                    if confirmation.review != ReviewDecision.APPROVE:
-                        deny_message = confirmation.custom_deny_message or "Command not approved by user"
-                        logger.info(f"Command denied: {deny_message}")
-                        return deny_message
-
-                    logger.info("Command approved")
-                except Exception as e:
-                    error_msg = f"Error during command confirmation: {str(e)}"
-                    logger.error(error_msg)
-                    return error_msg
+                # Confirm the command exactly as it will run, a string is passed to the shell unchanged
+                deny_message = self._request_confirmation(command, None, "Command")
+                if deny_message is not None:
+                    return deny_message
 
             # Execute the command
             try:
@@ -199,42 +262,29 @@ class CodevAgent:
             Returns:
                 Result message
             """
-            logger.debug(f"Writing to file: {path}")
+            logger.debug("Writing to file: {}", path)
 
             # Check if we need to confirm
             if (self.approval_policy != "full-auto" and self.approval_policy != "auto-edit"
                     and self.get_command_confirmation):
-                try:
-                    # Create apply patch command for confirmation
-                    apply_patch = ApplyPatchCommand(
-                        file_path=path,
-                        content=content
-                    )
-
-                    # For synchronous operation, we need to handle the confirmation differently
-                    if hasattr(self.get_command_confirmation, "__call__"):
-                        confirmation = self.get_command_confirmation(["edit", path], apply_patch)
-                    else:
-                        # If the confirmation function is async, we can't call it directly
-                        confirmation = CommandConfirmation(review=ReviewDecision.APPROVE)
-                    if confirmation.review != ReviewDecision.APPROVE:
-                        deny_message = confirmation.custom_deny_message or "File edit not approved by user"
-                        logger.info(f"File edit denied: {deny_message}")
-                        return deny_message
-
-                    logger.info("File edit approved")
-                except Exception as e:
-                    error_msg = f"Error during file edit confirmation: {str(e)}"
-                    logger.error(error_msg)
-                    return error_msg
+                # Create apply patch command for confirmation
+                apply_patch = ApplyPatchCommand(
+                    file_path=path,
+                    content=content
+                )
+                deny_message = self._request_confirmation(["edit", path], apply_patch, "File edit")
+                if deny_message is not None:
+                    return deny_message
 
             # Write the file
             try:
+                # Check before writing, afterwards the file always exists
+                existed = os.path.lexists(path) if self.history_manager else True
                 result = original_write(path, content, **kwargs)
 
                 # Add to history manager if available
                 if self.history_manager:
-                    operation = "create" if not os.path.exists(path) else "edit"
+                    operation = "edit" if existed else "create"
                     self.history_manager.add_file_edit(path, operation)
 
                 return result
@@ -246,7 +296,7 @@ class CodevAgent:
         # Custom read method
         def custom_read(path: str, **kwargs):
             """Read a file"""
-            logger.debug(f"Reading file: {path}")
+            logger.debug("Reading file: {}", path)
             try:
                 return original_read(path, **kwargs)
             except Exception as e:
@@ -265,28 +315,13 @@ class CodevAgent:
             Returns:
                 Result message
             """
-            logger.debug(f"Deleting file: {path}")
+            logger.debug("Deleting file: {}", path)
 
             # Check if we need to confirm
             if self.approval_policy != "full-auto" and self.get_command_confirmation:
-                try:
-                    # For synchronous operation, we need to handle the confirmation differently
-                    if hasattr(self.get_command_confirmation, "__call__"):
-                        confirmation = self.get_command_confirmation(["delete", path], None)
-                    else:
-                        # If the confirmation function is async, we can't call it directly
-                        confirmation = CommandConfirmation(review=ReviewDecision.APPROVE)
-
-                    if confirmation.review != ReviewDecision.APPROVE:
-                        deny_message = confirmation.custom_deny_message or "File deletion not approved by user"
-                        logger.info(f"File deletion denied: {deny_message}")
-                        return deny_message
-
-                    logger.info("File deletion approved")
-                except Exception as e:
-                    error_msg = f"Error during file deletion confirmation: {str(e)}"
-                    logger.error(error_msg)
-                    return error_msg
+                deny_message = self._request_confirmation(["delete", path], None, "File deletion")
+                if deny_message is not None:
+                    return deny_message
 
             # Delete the file
             try:
@@ -309,6 +344,39 @@ class CodevAgent:
 
         return file_tool
 
+    def _request_confirmation(self, command: Union[str, List[str]], apply_patch: Optional[ApplyPatchCommand],
+                              action: str) -> Optional[str]:
+        """
+        Ask the user to confirm a tool action
+
+        Args:
+            command: The command shown to the user
+            apply_patch: Optional patch to apply
+            action: Name of the action used in messages, e.g. "Command" or "File edit"
+
+        Returns:
+            None if the action is approved, otherwise the message returned to the model
+        """
+        try:
+            # For synchronous operation, we need to handle the confirmation differently
+            if hasattr(self.get_command_confirmation, "__call__"):
+                confirmation = self.get_command_confirmation(command, apply_patch)
+            else:
+                # If the confirmation function is async, we can't call it directly
+                confirmation = CommandConfirmation(review=ReviewDecision.APPROVE)
+
+            if confirmation.review != ReviewDecision.APPROVE:
+                deny_message = confirmation.custom_deny_message or f"{action} not approved by user"
+                logger.info("{} denied: {}", action, deny_message)
+                return deny_message
+
+            logger.info("{} approved", action)
+            return None
+        except Exception as e:
+            error_msg = f"Error during {action.lower()} confirmation: {str(e)}"
+            logger.error(error_msg)
+            return error_msg
+
     def _generate_session_id(self):
         """Generate a unique session ID"""
         return f"session_{int(time.time())}"
@@ -3,12 +3,21 @@
 @author:XuMing(xuming624@qq.com)
 @description:
 """
-from typing import List, Optional, Dict, Any, Tuple
+import os
+import sys
+from typing import List, Optional, Tuple, FrozenSet
 from dataclasses import dataclass
 
+from codev.format_command import truncate_lines
+
 # Approval policy types
 ApprovalPolicy = str  # "suggest", "auto-edit", or "full-auto"
 
+# Valid answers of the confirmation prompt
+DECISION_CHOICES = frozenset(("a", "d", "e", "m"))
+# Seconds to wait for the rest of a terminal escape sequence
+_ESCAPE_TIMEOUT = 0.05
+
 
 @dataclass
 class ApplyPatchCommand:
@@ -17,6 +26,108 @@ class ApplyPatchCommand:
     content: str
 
 
+def _split_keys(text: str) -> List[str]:
+    """
+    Split terminal input into keys, keeping each escape sequence (arrow keys, Alt+key, ...) as one key
+
+    Args:
+        text: Characters read from the terminal
+
+    Returns:
+        List of keys
+    """
+    keys = []
+    i, n = 0, len(text)
+    while i < n:
+        j = i + 1
+        if text[i] == "\x1b" and j < n:
+            if text[j] == "[":
+                # CSI sequence, ends with a byte in the range @ to ~
+                j += 1
+                while j < n and not "@" <= text[j] <= "~":
+                    j += 1
+                j = min(j + 1, n)
+            elif text[j] == "O":
+                # SS3 sequence, e.g. arrow keys in application mode
+                j = min(j + 2, n)
+            else:
+                # Alt+key
+                j += 1
+        keys.append(text[i:j])
+        i = j
+    return keys
+
+
+def _read_keys() -> List[str]:
+    """Read the keys pressed on the terminal without waiting for Enter"""
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+    if msvcrt is not None:
+        key = msvcrt.getwch()
+        if key == "\x03":
+            # getwch returns Ctrl+C instead of raising
+            raise KeyboardInterrupt
+        if key in ("\x00", "\xe0"):
+            # Prefix of an arrow or function key, the key code follows
+            key += msvcrt.getwch()
+        return [key]
+
+    import select
+    import termios
+    import tty
+
+    fd = sys.stdin.fileno()
+    old_settings = termios.tcgetattr(fd)
+    try:
+        tty.setcbreak(fd)
+        data = os.read(fd, 64)
+        if not data:
+            raise EOFError
+        # The rest of an escape sequence may not have arrived yet
+        while b"\x1b" in data and select.select([fd], [], [], _ESCAPE_TIMEOUT)[0]:
+            chunk = os.read(fd, 64)
+            if not chunk:
+                break
+            data += chunk
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+    return _split_keys(data.decode("utf-8", errors="ignore"))
+
+
+def read_choice(prompt: str, choices: FrozenSet[str]) -> str:
+    """
+    Read a single-key choice from the user
+
+    On a terminal the choice is taken on key press, otherwise a line is read with input().
+
+    Args:
+        prompt: Prompt shown to the user
+        choices: Valid lowercase choices
+
+    Returns:
+        The chosen key
+    """
+    if not sys.stdin.isatty():
+        decision = ""
+        while decision not in choices:
+            decision = input(prompt).strip().lower()
+        return decision
+
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    while True:
+        for key in _read_keys():
+            # Only plain keys are lowercased, escape sequences never match a choice
+            if len(key) == 1:
+                key = key.lower()
+            if key in choices:
+                # Echo the key so the user sees the choice
+                print(key)
+                return key
+
+
 def generate_command_explanation(command: List[str], model: str) -> str:
     """
     Generate a human-readable explanation of what a command does
@@ -49,13 +160,11 @@ def confirm_command(command: List[str], patch: Optional[ApplyPatchCommand] = Non
         print(f"\nThe AI assistant wants to edit file: {patch.file_path}")
         print(f"Preview of changes:")
         print("```")
-        lines = patch.content.split('\n')
         # Only show first 10 lines if too long
-        if len(lines) > 10:
-            print('\n'.join(lines[:10]))
-            print(f"... and {len(lines) - 10} more lines")
-        else:
-            print(patch.content)
+        preview, dropped = truncate_lines(patch.content, 10)
+        print(preview)
+        if dropped:
+            print(f"... and {dropped} more lines")
         print("```")
     else:
         print(f"\nThe AI assistant wants to run: {command_str}")
@@ -66,9 +175,7 @@ def confirm_command(command: List[str], patch: Optional[ApplyPatchCommand] = Non
     print("  (e)xplain - Ask for an explanation")
     print("  (m)odify - Modify the command before running")
 
-    decision = ""
-    while decision not in ["a", "d", "e", "m"]:
-        decision = input("Your choice [a/d/e/m]: ").lower()
+    decision = read_choice("Your choice [a/d/e/m]: ", DECISION_CHOICES)
 
     custom_deny_message = None
     if decision == "d":
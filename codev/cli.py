@@ -6,10 +6,8 @@
 import os
 import sys
 import argparse
-from loguru import logger
 
 from codev.config import load_config, CLI_VERSION, ROOT_DIR
-from codev.terminal_chat import TerminalChat
 
 
 def main():
@@ -33,6 +31,7 @@ def main():
         sys.exit(0)
 
     # Configure logging
+    from loguru import logger
     logger.remove()
     logger.add(sys.stderr, level="INFO")
     logger.add(os.path.join(ROOT_DIR, "codev_cli.log"), rotation="10 MB")
@@ -44,6 +43,9 @@ def main():
     if args.model:
         config.model = args.model
 
+    # Import lazily so that --help/--version do not pay for loading the agent stack
+    from codev.terminal_chat import TerminalChat
+
     # Run terminal chat
     m = TerminalChat(
         config=config,
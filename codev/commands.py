@@ -128,7 +128,7 @@ class CommandHandler:
 │                                                                              │
 │ Slash Commands                                                               │
 │ /help – Show this help information                                           │
-│ /model – Switch language model in session                                    │
+│ /model [refresh] – Switch language model in session                          │
 │ /approval – Switch approval mode                                             │
 │ /history [all] [full] – Show command and file history                        │
 │ /clear – Clear screen and context                                            │
@@ -142,10 +142,16 @@ class CommandHandler:
 """
         print(help_text)
 
-    def switch_model(self):
-        """Switch model"""
+    def switch_model(self, args=None):
+        """
+        Switch model
+
+        Args:
+            args: Command argument list, may include 'refresh' to reload the cached model list
+        """
+        args = args or []
         try:
-            available_models = get_available_models()
+            available_models = get_available_models(refresh='refresh' in args)
 
             if not available_models:
                 print(f"{TermColor.RED}Unable to get list of available models.{TermColor.RESET}")
@@ -192,14 +198,15 @@ class CommandHandler:
             "full-auto": "Fully automatic mode, no confirmation needed"
         }
 
+        current_policy = self.terminal.approval_policy
         print(f"{TermColor.CYAN}Available approval policies:{TermColor.RESET}")
         for i, policy in enumerate(policies, 1):
-            current = " (currently used)" if policy == self.terminal.approval_policy else ""
+            current = " (currently used)" if policy == current_policy else ""
             color = POLICY_COLORS.get(policy, TermColor.WHITE)
             print(f"{i}. {color}{policy}{TermColor.RESET} - {policy_descriptions[policy]}{current}")
 
-        print(f"\nCurrent policy: {POLICY_COLORS.get(self.terminal.approval_policy, TermColor.WHITE)}"
-              f"{self.terminal.approval_policy}{TermColor.RESET}")
+        print(f"\nCurrent policy: {POLICY_COLORS.get(current_policy, TermColor.WHITE)}"
+              f"{current_policy}{TermColor.RESET}")
         print("Please enter the policy number or name to use:")
 
         try:
@@ -336,10 +343,7 @@ class CommandHandler:
                 return
 
             # Reset conversation history, keeping only the summary
-            self.terminal.agent.conversation_history = [
-                {"role": "system", "content": "You are a helpful programming assistant."},
-                {"role": "user", "content": f"Conversation summary: {summary}"}
-            ]
+            self.terminal.agent.compact_history(summary)
 
             print(f"{TermColor.GREEN}Conversation context has been compressed.{TermColor.RESET}")
             print(f"{TermColor.BLUE}Summary:{TermColor.RESET} {summary}")
@@ -6,7 +6,7 @@
 import os
 import json
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import Optional, Dict, Any
 from codev.version import __version__
 
 
@@ -14,6 +14,8 @@ ROOT_DIR = os.getenv("CODEV_HOME", os.path.expanduser("~/.codev/"))
 # Constants
 OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL", "https://api.openai.com/v1/").rstrip("/")
 DEFAULT_MODEL = "gpt-4o"
+# Number of previous responses sent with each request
+DEFAULT_NUM_HISTORY_RESPONSES = 3
 CLI_VERSION = __version__
 
 
@@ -23,6 +25,8 @@ class AppConfig:
     model: str = DEFAULT_MODEL
     instructions: Optional[str] = None
     debug: bool = False
+    num_history_responses: int = DEFAULT_NUM_HISTORY_RESPONSES
+    max_tokens: Optional[int] = None  # Max tokens per response, None for the model default
     theme: Dict[str, Any] = field(default_factory=dict)
 
     def __post_init__(self):
@@ -66,6 +70,10 @@ def load_config(config_path: Optional[str] = None) -> AppConfig:
                 config.instructions = config_data["instructions"]
             if "debug" in config_data:
                 config.debug = config_data["debug"]
+            if "num_history_responses" in config_data:
+                config.num_history_responses = config_data["num_history_responses"]
+            if "max_tokens" in config_data:
+                config.max_tokens = config_data["max_tokens"]
             if "theme" in config_data:
                 config.theme.update(config_data["theme"])
 
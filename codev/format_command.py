@@ -3,17 +3,20 @@
 @author:XuMing(xuming624@qq.com)
 @description:
 """
-from typing import List
+from typing import List, Tuple, Union
 import shlex
 import re
 
+# Fallback tokenizer for parse_command: bare words, "double" or 'single' quoted strings
+_COMMAND_TOKEN_RE = re.compile(r'([^\s"\']+)|"([^"]*)"|\'([^\']*)\'')
 
-def format_command_for_display(command: List[str]) -> str:
+
+def format_command_for_display(command: Union[str, List[str]]) -> str:
     """
     Format a command array for display to the user
     
     Args:
-        command: List of command parts (command and arguments)
+        command: Command string, or list of command parts (command and arguments)
         
     Returns:
         A formatted string representation of the command
@@ -50,5 +53,23 @@ def parse_command(command_str: str) -> List[str]:
     except Exception:
         # Simple fallback if shlex.split fails
         # Split on spaces but preserve quoted strings
-        pattern = r'([^\s"\']+)|"([^"]*)"|\'([^\']*)\')'
-        return [match[0] or match[1] or match[2] for match in re.findall(pattern, command_str)]
+        return [match[0] or match[1] or match[2] for match in _COMMAND_TOKEN_RE.findall(command_str)]
+
+
+def truncate_lines(text: str, max_lines: int) -> Tuple[str, int]:
+    """
+    Keep the first lines of a text in a single pass, without splitting the whole text
+
+    Args:
+        text: The text to truncate
+        max_lines: Maximum number of lines to keep
+
+    Returns:
+        Tuple of (first max_lines lines, number of dropped lines)
+    """
+    idx = -1
+    for _ in range(max_lines):
+        idx = text.find('\n', idx + 1)
+        if idx < 0:
+            return text, 0
+    return text[:idx], text.count('\n', idx + 1) + 1
@@ -10,6 +10,11 @@ from datetime import datetime
 from typing import List, Dict, Any, Optional
 from loguru import logger
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from codev.commands import TermColor
 from codev.config import ROOT_DIR
 
@@ -68,21 +73,29 @@ class HistoryManager:
             if len(backup_files) > 10:
                 for old_file in backup_files[:-10]:
                     os.remove(old_file)
-                    logger.debug(f"Removed old history backup: {old_file}")
+                    logger.debug("Removed old history backup: {}", old_file)
         except Exception as e:
             logger.error(f"Error cleaning up old backups: {str(e)}")
 
+    @staticmethod
+    def _read_json(path: str) -> Dict[str, Any]:
+        """Read a history JSON file, with orjson when it is installed"""
+        if orjson is not None:
+            with open(path, 'rb') as f:
+                return orjson.loads(f.read())
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
     def load_history(self) -> None:
         """Load history record file"""
         try:
             if os.path.exists(self.history_file):
-                with open(self.history_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.command_history = data.get('commands', [])
-                    self.file_edit_history = data.get('files', [])
+                data = self._read_json(self.history_file)
+                self.command_history = data.get('commands', [])
+                self.file_edit_history = data.get('files', [])
 
-                logger.debug(f"History records loaded: {len(self.command_history)} commands, "
-                             f"{len(self.file_edit_history)} file edits")
+                logger.debug("History records loaded: {} commands, {} file edits",
+                             len(self.command_history), len(self.file_edit_history))
 
                 # Create a backup when loading (ensures we have a backup even if the file gets corrupted)
                 self.create_backup()
@@ -109,10 +122,9 @@ class HistoryManager:
             latest_backup = backup_files[0]
 
             # Load from the most recent backup
-            with open(latest_backup, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self.command_history = data.get('commands', [])
-                self.file_edit_history = data.get('files', [])
+            data = self._read_json(latest_backup)
+            self.command_history = data.get('commands', [])
+            self.file_edit_history = data.get('files', [])
 
             logger.info(f"Restored history from backup: {latest_backup}")
             # Copy the backup to the main history file
@@ -128,11 +140,16 @@ class HistoryManager:
     def save_history(self) -> None:
         """Save history records to file"""
         try:
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'commands': self.command_history,
-                    'files': self.file_edit_history
-                }, f, ensure_ascii=False, indent=2)
+            data = {
+                'commands': self.command_history,
+                'files': self.file_edit_history
+            }
+            if orjson is not None:
+                with open(self.history_file, 'wb') as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(self.history_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
 
             # Create periodic backup (every 10 saves)
             if hash(str(self.command_history) + str(self.file_edit_history)) % 10 == 0:
@@ -4,17 +4,129 @@
 @description:
 """
 import os
+import json
+import time
+import hashlib
+from functools import lru_cache
 from typing import List, Optional
 from loguru import logger
-from openai import OpenAI
 
-from codev.config import OPENAI_BASE_URL
+from codev.config import OPENAI_BASE_URL, ROOT_DIR
 
+MODELS_CACHE_FILE = os.path.join(ROOT_DIR, "models_cache.json")
+# Seconds a cached model list stays valid
+MODELS_CACHE_TTL = 24 * 60 * 60
 
-def get_available_models() -> List[str]:
+
+@lru_cache(maxsize=1)
+def get_http_client():
+    """
+    Get the HTTP client shared by all OpenAI clients of the process
+
+    Keeping one pooled client alive lets every request after the first reuse
+    an open connection instead of paying a new TCP+TLS handshake. HTTP/2 is
+    enabled when the optional `h2` package is installed.
+
+    Returns:
+        httpx.Client instance
+    """
+    import httpx
+
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    return httpx.Client(
+        http2=http2,
+        timeout=httpx.Timeout(600.0, connect=5.0),
+        limits=httpx.Limits(max_keepalive_connections=4, max_connections=8, keepalive_expiry=60.0),
+    )
+
+
+def get_openai_client(**client_params):
+    """
+    Get a sync OpenAI client that sends its requests over the shared HTTP client
+
+    Only the sync client may use the pooled httpx.Client, AsyncOpenAI needs an
+    httpx.AsyncClient bound to the running event loop.
+
+    Args:
+        client_params: Keyword arguments for the OpenAI client, e.g. api_key, base_url
+
+    Returns:
+        openai.OpenAI instance
+    """
+    # Import lazily, openai pulls in httpx/pydantic and slows down CLI start
+    from openai import OpenAI
+
+    return OpenAI(http_client=get_http_client(), **client_params)
+
+
+def _models_cache_key(api_key: str) -> str:
+    """
+    Get the key of the model list cache, different API keys may see different models
+
+    Args:
+        api_key: OpenAI API key
+
+    Returns:
+        Hash of the API base URL and key, so the key itself is not written to disk
+    """
+    return hashlib.sha256(f"{OPENAI_BASE_URL}\n{api_key}".encode('utf-8')).hexdigest()
+
+
+def _load_cached_models(api_key: str) -> Optional[List[str]]:
+    """
+    Load the model list cached for the current API base URL and key
+
+    Args:
+        api_key: OpenAI API key
+
+    Returns:
+        Cached model names, or None if there is no fresh cache entry
+    """
+    try:
+        with open(MODELS_CACHE_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # Anything else than the expected layout is a cache miss
+    if not isinstance(data, dict) or data.get('key') != _models_cache_key(api_key):
+        return None
+    timestamp = data.get('timestamp')
+    models = data.get('models')
+    if (isinstance(timestamp, (int, float)) and time.time() - timestamp < MODELS_CACHE_TTL
+            and isinstance(models, list) and models and all(isinstance(m, str) for m in models)):
+        return models
+    return None
+
+
+def _save_cached_models(models: List[str], api_key: str) -> None:
+    """
+    Cache the model list for the current API base URL and key
+
+    Args:
+        models: Model names to cache
+        api_key: OpenAI API key
+    """
+    try:
+        os.makedirs(ROOT_DIR, exist_ok=True)
+        tmp_file = MODELS_CACHE_FILE + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'key': _models_cache_key(api_key), 'timestamp': time.time(), 'models': models}, f)
+        os.replace(tmp_file, MODELS_CACHE_FILE)
+    except OSError as e:
+        logger.debug("Failed to cache model list: {}", e)
+
+
+def get_available_models(refresh: bool = False) -> List[str]:
     """
     Get a list of available models from the OpenAI API
     
+    Args:
+        refresh: Fetch the list from the API even if a cached list is available
+
     Returns:
         List of model names that can be used with the API
     """
@@ -23,12 +135,14 @@ def get_available_models() -> List[str]:
         logger.warning(f"OPENAI_API_KEY environment variable not set, api_key: {api_key}")
         return []
 
+    if not refresh:
+        cached_models = _load_cached_models(api_key)
+        if cached_models:
+            return cached_models
+
     try:
         # Create OpenAI client
-        client = OpenAI(
-            api_key=api_key,
-            base_url=OPENAI_BASE_URL
-        )
+        client = get_openai_client(api_key=api_key, base_url=OPENAI_BASE_URL)
 
         # Fetch models
         response = client.models.list()
@@ -38,6 +152,8 @@ def get_available_models() -> List[str]:
         for model in response.data:
             models.append(model.id)
         gpt_models = [m for m in models if m]
+        if gpt_models:
+            _save_cached_models(gpt_models, api_key)
         return gpt_models
     except Exception as e:
         logger.error(f"Error fetching models: {str(e)}")
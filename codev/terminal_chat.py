@@ -5,20 +5,100 @@
 """
 
 import os
+import re
 import sys
 import time
+import queue
+import atexit
 import threading
-import readline
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
 from loguru import logger
-from typing import List, Optional
+from typing import List, Optional, Union
+
+try:
+    import readline
+except ImportError:  # Not available on Windows
+    readline = None
+
+try:
+    from wcwidth import wcswidth
+except ImportError:
+    wcswidth = None
 
 from codev.config import AppConfig, CLI_VERSION, ROOT_DIR
 from codev.agent import ReviewDecision, CommandConfirmation, ApplyPatchCommand, CodevAgent
-from codev.format_command import format_command_for_display
-from codev.approvals import generate_command_explanation, ApprovalPolicy
+from codev.format_command import format_command_for_display, truncate_lines
+from codev.approvals import generate_command_explanation, read_choice, ApprovalPolicy
 from codev.commands import CommandHandler, TermColor, COLOR_MAP, POLICY_COLORS
 from codev.history_manager import HistoryManager
 
+# Max number of response chunks buffered between the agent worker and the terminal
+MESSAGE_QUEUE_SIZE = 256
+# Max seconds stream chunks are buffered before being written to the terminal
+STREAM_FLUSH_INTERVAL = 0.03
+# Sentinel pushed by the agent worker when a response is complete
+_RESPONSE_END = object()
+# Deny message returned to the model for a confirmation pending when the request is cancelled
+_CANCELLED_MESSAGE = "Request cancelled by user"
+
+# ANSI SGR color sequences, ignored when measuring visible width
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+
+# Header box width and colors
+HEADER_BOX_WIDTH = 60
+_HEADER_COLOR = TermColor.BRIGHT_CYAN
+_ACCENT_COLOR = TermColor.BRIGHT_GREEN
+
+# Home directory, resolved once for short_cwd
+_HOME = os.path.expanduser("~")
+
+# Precomputed "%s" templates wrapping text in each color's SGR prefix and reset suffix
+_COLOR_TEMPLATES = {name: f"{code}%s{TermColor.RESET}" for name, code in COLOR_MAP.items()}
+_DEFAULT_COLOR_TEMPLATE = f"{TermColor.WHITE}%s{TermColor.RESET}"
+
+# Option menus of the command confirmation dialog, printed with a single write
+CONFIRM_OPTIONS = (
+    "\nOptions:\n"
+    f"  {TermColor.GREEN}(a)pprove{TermColor.RESET} - Execute the command\n"
+    f"  {TermColor.RED}(d)eny{TermColor.RESET} - Reject the command\n"
+    f"  {TermColor.BLUE}(e)xplain{TermColor.RESET} - Ask for an explanation"
+)
+EXPLAINED_OPTIONS = (
+    "\nNow that you have an explanation:\n"
+    f"  {TermColor.GREEN}(a)pprove{TermColor.RESET} - Execute the command\n"
+    f"  {TermColor.RED}(d)eny{TermColor.RESET} - Reject the command"
+)
+
+# Fixed parts of the confirmation dialog
+_EDIT_PREFIX = f"\n{TermColor.YELLOW}The AI assistant wants to edit file: "
+_RUN_PREFIX = f"\n{TermColor.YELLOW}The AI assistant wants to run: "
+_PREVIEW_TITLE = f"{TermColor.YELLOW}Preview of changes:{TermColor.RESET}"
+_CODE_FENCE = f"{TermColor.CYAN}```{TermColor.RESET}"
+_EXPLANATION_TITLE = f"\n{TermColor.CYAN}Explanation:{TermColor.RESET}"
+
+# Valid answers of the confirmation dialog and inputs that exit the chat
+CONFIRM_CHOICES = frozenset(("a", "d", "e"))
+EXPLAINED_CHOICES = frozenset(("a", "d"))
+EXIT_INPUTS = frozenset(("\\q", "exit", "quit"))
+
+# Slash commands offered by TAB completion, sorted so a prefix matches a contiguous slice
+SLASH_COMMANDS = tuple(sorted((
+    "/help", "/model", "/approval", "/history",
+    "/clear", "/clearhistory", "/compact", "/exit", "/quit",
+)))
+
+
+@dataclass
+class _ConfirmationRequest:
+    """Tool confirmation asked by the agent worker and answered on the main thread"""
+    command: Union[str, List[str]]
+    apply_patch: Optional[ApplyPatchCommand]
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Optional[CommandConfirmation] = None
+
 
 def colored_text(text: str, color: str) -> str:
     """
@@ -31,8 +111,72 @@ def colored_text(text: str, color: str) -> str:
     Returns:
         Colored text string
     """
-    color_code = COLOR_MAP.get(color, TermColor.WHITE)
-    return f"{color_code}{text}{TermColor.RESET}"
+    return _COLOR_TEMPLATES.get(color, _DEFAULT_COLOR_TEMPLATE) % (text,)
+
+
+# Constant message labels, colored once
+_LABEL_SYSTEM = colored_text('System: ', 'yellow')
+_LABEL_ERROR = colored_text('Error: ', 'bright_red')
+_LABEL_PROMPT = colored_text('> ', 'bright_blue')
+
+
+def complete_command(text: str, state: int) -> Optional[str]:
+    """
+    Readline completer for slash commands
+
+    Args:
+        text: Prefix typed so far
+        state: Index of the requested match
+
+    Returns:
+        The matching command, or None when there are no more matches
+    """
+    index = bisect_left(SLASH_COMMANDS, text) + state
+    if index < len(SLASH_COMMANDS) and SLASH_COMMANDS[index].startswith(text):
+        return SLASH_COMMANDS[index]
+    return None
+
+
+def _visible_len(text: str) -> int:
+    """Width of text as shown on the terminal, without ANSI color codes and counting wide characters twice"""
+    text = _ANSI_RE.sub('', text)
+    if wcswidth is not None:
+        width = wcswidth(text)
+        if width >= 0:
+            return width
+    return len(text)
+
+
+def _header_line(content: str) -> str:
+    """
+    Pad a header line to the box width and close it with the right border
+
+    Args:
+        content: Line content, starting with the left border
+
+    Returns:
+        The boxed header line
+    """
+    padding = HEADER_BOX_WIDTH - _visible_len(content)
+    return f"{content}{' ' * padding}{_HEADER_COLOR}│{TermColor.RESET}"
+
+
+# Header lines that do not depend on the session, built once
+_HEADER_TOP = f"{_HEADER_COLOR}╭{'─' * (HEADER_BOX_WIDTH - 1)}╮{TermColor.RESET}"
+_HEADER_BOTTOM = f"{_HEADER_COLOR}╰{'─' * (HEADER_BOX_WIDTH - 1)}╯{TermColor.RESET}"
+_HEADER_APP_NAME = _header_line(
+    f"{_HEADER_COLOR}│{TermColor.RESET} {_ACCENT_COLOR}Codev CLI{TermColor.RESET} - Interactive AI Coding Agent"
+)
+_HEADER_VERSION = _header_line(
+    f"{_HEADER_COLOR}│{TermColor.RESET} Version: {CLI_VERSION}"
+)
+_HEADER_HELP = _header_line(
+    f"{_HEADER_COLOR}│{TermColor.RESET} Type {_ACCENT_COLOR}/help{TermColor.RESET} for available commands"
+)
+_HEADER_INPUT = _header_line(
+    f"{_HEADER_COLOR}│{TermColor.RESET} Input with {_ACCENT_COLOR}>{TermColor.RESET} prompt, "
+    f"press {_ACCENT_COLOR}Enter twice{TermColor.RESET} to submit"
+)
 
 
 def short_cwd() -> str:
@@ -42,13 +186,62 @@ def short_cwd() -> str:
     Returns:
         Shortened path string
     """
-    home = os.path.expanduser("~")
     cwd = os.getcwd()
-    if cwd.startswith(home):
-        return "~" + cwd[len(home):]
+    if cwd.startswith(_HOME):
+        return "~" + cwd[len(_HOME):]
     return cwd
 
 
+@lru_cache(maxsize=8)
+def render_header(model: str, approval_policy: str, cwd: str) -> str:
+    """
+    Render the application header, cached as it only changes with the model, policy or directory
+
+    Args:
+        model: Current model name
+        approval_policy: Current approval policy
+        cwd: Working directory to display
+
+    Returns:
+        The header text, ready to be written with a single write
+    """
+    header_color = _HEADER_COLOR
+    accent_color = _ACCENT_COLOR
+    reset = TermColor.RESET
+
+    # Model info
+    model_info = f"{header_color}│{reset} Model: {accent_color}{model}{reset}"
+    model_line = _header_line(model_info)
+
+    # Approval policy info
+    policy_color = POLICY_COLORS.get(approval_policy, TermColor.WHITE)
+    policy_info = f"{header_color}│{reset} Approval Policy: {policy_color}{approval_policy}{reset}"
+    policy_line = _header_line(policy_info)
+
+    # Working directory
+    display_cwd = cwd
+    cwd_info = f"{header_color}│{reset} Working Directory: {display_cwd}"
+    if _visible_len(cwd_info) > HEADER_BOX_WIDTH - 4:
+        # Truncate if too long
+        max_cwd_len = HEADER_BOX_WIDTH - 24  # Allow space for the label and ellipsis
+        if len(display_cwd) > max_cwd_len:
+            display_cwd = "..." + display_cwd[-(max_cwd_len - 3):]
+        cwd_info = f"{header_color}│{reset} Working Directory: {display_cwd}"
+    cwd_line = _header_line(cwd_info)
+
+    return "\n".join((
+        _HEADER_TOP,
+        _HEADER_APP_NAME,
+        _HEADER_VERSION,
+        model_line,
+        policy_line,
+        cwd_line,
+        _HEADER_HELP,
+        _HEADER_INPUT,
+        _HEADER_BOTTOM,
+    )) + "\n\n"
+
+
 class TerminalChat:
     """
     Terminal-based chat interface for interacting with the AI assistant using agentica's Agent
@@ -83,10 +276,17 @@ class TerminalChat:
         self.loading = False
         self.thinking_start_time = 0
         self.should_exit = False
-        self._input_history = []  # Initialize input history
+        self._input_history = deque(maxlen=50)  # Initialize input history, oldest entries are evicted
         self._indicator_thread = None  # Thread for thinking indicator
+        self._indicator_stop = threading.Event()  # Set to stop the thinking indicator thread
         self._paused_thinking = False  # Flag to pause thinking indicator
         self._pause_start_time = 0  # Time when thinking was paused
+        self._shown_elapsed = -1  # Elapsed seconds last drawn by the thinking indicator
+        self._readline = None  # readline module, set up in run() when available
+        self._chat_history_file = None  # readline history file, saved after each message
+        self._append_history_supported = False  # Whether readline can append to the history file
+        self._worker = None  # Daemon thread running the current agent request
+        self._worker_state = threading.local()  # Message queue and cancel event of the request run by a worker
 
         # Initialize history manager
         self.history_manager = HistoryManager()
@@ -95,10 +295,11 @@ class TerminalChat:
         self.agent = CodevAgent(
             config=self.config,
             approval_policy=self.approval_policy,
-            get_command_confirmation=self.get_command_confirmation,
+            get_command_confirmation=self._confirm_from_worker,
             history_manager=self.history_manager,
             instructions=self.config.instructions,
             debug=self.config.debug,
+            full_stdout=self.full_stdout,
         )
         # Initialize command handler
         self.command_handler = CommandHandler(self)
@@ -117,9 +318,9 @@ class TerminalChat:
             # Print without "Assistant:" prefix
             print(f"\n{content}")
         elif role == "system":
-            print(f"{colored_text('System: ', 'yellow')}{content}")
+            print(f"{_LABEL_SYSTEM}{content}")
         elif role == "error":
-            print(f"{colored_text('Error: ', 'bright_red')}{content}")
+            print(f"{_LABEL_ERROR}{content}")
 
     def handle_loading_state(self, is_loading: bool):
         """
@@ -133,31 +334,38 @@ class TerminalChat:
             self.thinking_start_time = time.time()
             self._paused_thinking = False
             self._pause_start_time = 0
+            self._shown_elapsed = -1
 
             # Start the thinking indicator thread
+            stop_event = self._indicator_stop
+            stop_event.clear()
+
             def update_indicator():
-                while self.loading:
+                while not stop_event.is_set():
                     if not self._paused_thinking:
                         self.show_thinking_indicator()
-                    time.sleep(1)  # Update every second
+                    # Wake up at the next whole second of elapsed time, or immediately when stopped
+                    stop_event.wait(1 - (time.time() - self.thinking_start_time) % 1)
 
             self._indicator_thread = threading.Thread(target=update_indicator)
             self._indicator_thread.daemon = True
             self._indicator_thread.start()
         else:
+            # Stop the indicator thread before clearing, so it cannot redraw afterwards
+            self._indicator_stop.set()
+            if self._indicator_thread:
+                self._indicator_thread.join(timeout=1)
+                self._indicator_thread = None
             # Clear the thinking indicator
             sys.stdout.write("\r" + " " * 30 + "\r")
             sys.stdout.flush()
-            # Wait for indicator thread to finish if it exists
-            if self._indicator_thread:
-                self._indicator_thread.join(timeout=0.1)
-                self._indicator_thread = None
 
     def pause_thinking(self):
         """Pause the thinking indicator and remember the elapsed time"""
         if self.loading:
             self._paused_thinking = True
             self._pause_start_time = time.time()
+            self._shown_elapsed = -1  # The line is cleared, redraw on resume
             # Clear the thinking indicator
             sys.stdout.write("\r" + " " * 30 + "\r")
             sys.stdout.flush()
@@ -174,10 +382,14 @@ class TerminalChat:
         """Show a thinking indicator with elapsed time while waiting for a response"""
         if self.loading and not self._paused_thinking:
             elapsed = int(time.time() - self.thinking_start_time)
+            # Only redraw when the shown number of seconds changes
+            if elapsed == self._shown_elapsed:
+                return
+            self._shown_elapsed = elapsed
             sys.stdout.write(f"\rThinking... ({elapsed}s)")
             sys.stdout.flush()
 
-    def get_command_confirmation(self, command: List[str],
+    def get_command_confirmation(self, command: Union[str, List[str]],
                                  apply_patch: Optional[ApplyPatchCommand]) -> CommandConfirmation:
         """
         Get confirmation from the user for executing a command
@@ -193,32 +405,26 @@ class TerminalChat:
         self.pause_thinking()
 
         try:
-            # Display the command for confirmation
-            command_str = format_command_for_display(command)
-
+            # Display the command for confirmation, together with the options, in a single write
             if apply_patch:
-                print(f"\n{TermColor.YELLOW}The AI assistant wants to edit file: {apply_patch.file_path}{TermColor.RESET}")
-                print(f"{TermColor.YELLOW}Preview of changes:{TermColor.RESET}")
-                print(f"{TermColor.CYAN}```{TermColor.RESET}")
-                lines = apply_patch.content.split('\n')
                 # Only show first 10 lines if too long
-                if len(lines) > 10:
-                    print('\n'.join(lines[:10]))
-                    print(f"... and {len(lines) - 10} more lines")
-                else:
-                    print(apply_patch.content)
-                print(f"{TermColor.CYAN}```{TermColor.RESET}")
+                preview, dropped = truncate_lines(apply_patch.content, 10)
+                parts = [
+                    f"{_EDIT_PREFIX}{apply_patch.file_path}{TermColor.RESET}",
+                    _PREVIEW_TITLE,
+                    _CODE_FENCE,
+                    preview,
+                ]
+                if dropped:
+                    parts.append(f"... and {dropped} more lines")
+                parts.append(_CODE_FENCE)
             else:
-                print(f"\n{TermColor.YELLOW}The AI assistant wants to run: {command_str}{TermColor.RESET}")
-
-            print("\nOptions:")
-            print(f"  {TermColor.GREEN}(a)pprove{TermColor.RESET} - Execute the command")
-            print(f"  {TermColor.RED}(d)eny{TermColor.RESET} - Reject the command")
-            print(f"  {TermColor.BLUE}(e)xplain{TermColor.RESET} - Ask for an explanation")
+                command_str = format_command_for_display(command)
+                parts = [f"{_RUN_PREFIX}{command_str}{TermColor.RESET}"]
+            parts.append(CONFIRM_OPTIONS)
+            sys.stdout.write("\n".join(parts) + "\n")
 
-            decision = ""
-            while decision not in ["a", "d", "e"]:
-                decision = input("Your choice [a/d/e]: ").lower()
+            decision = read_choice("Your choice [a/d/e]: ", CONFIRM_CHOICES)
 
             custom_deny_message = None
             explanation = None
@@ -237,15 +443,9 @@ class TerminalChat:
                 review_decision = ReviewDecision.EXPLAIN
                 # Generate explanation
                 explanation = generate_command_explanation(command, self.config.model)
-                print(f"\n{TermColor.CYAN}Explanation:{TermColor.RESET}")
-                print(explanation)
-                print("\nNow that you have an explanation:")
-                print(f"  {TermColor.GREEN}(a)pprove{TermColor.RESET} - Execute the command")
-                print(f"  {TermColor.RED}(d)eny{TermColor.RESET} - Reject the command")
+                sys.stdout.write("\n".join((_EXPLANATION_TITLE, explanation, EXPLAINED_OPTIONS)) + "\n")
 
-                inner_decision = ""
-                while inner_decision not in ["a", "d"]:
-                    inner_decision = input("Your choice [a/d]: ").lower()
+                inner_decision = read_choice("Your choice [a/d]: ", EXPLAINED_CHOICES)
 
                 if inner_decision == "a":
                     review_decision = ReviewDecision.APPROVE
@@ -263,10 +463,112 @@ class TerminalChat:
             # Resume thinking indicator after confirmation is complete
             self.resume_thinking()
 
+    def _confirm_from_worker(self, command: Union[str, List[str]],
+                             apply_patch: Optional[ApplyPatchCommand]) -> CommandConfirmation:
+        """
+        Get a confirmation for a tool call made by the agent worker
+
+        The dialog is shown by the main thread, which owns the terminal input, the worker
+        waits for its answer. A cancelled request denies the pending confirmation.
+
+        Args:
+            command: The command to execute
+            apply_patch: Optional patch to apply
+
+        Returns:
+            CommandConfirmation with user's decision
+        """
+        active_request = getattr(self._worker_state, "request", None)
+        if active_request is None:
+            # Not called from an agent worker, the terminal can be used directly
+            return self.get_command_confirmation(command, apply_patch)
+
+        msg_queue, cancel_event = active_request
+        request = _ConfirmationRequest(command, apply_patch)
+        self._put_message(msg_queue, request, cancel_event)
+        # Poll the cancel event, so a cancelled request never leaves the worker waiting for an answer
+        while not request.done.wait(0.1):
+            if cancel_event.is_set():
+                break
+        if request.result is None:
+            return CommandConfirmation(review=ReviewDecision.DENY, custom_deny_message=_CANCELLED_MESSAGE)
+        return request.result
+
+    def _answer_confirmation(self, request: _ConfirmationRequest):
+        """
+        Show a confirmation dialog requested by the agent worker and hand back the answer
+
+        Args:
+            request: The pending confirmation request
+        """
+        try:
+            request.result = self.get_command_confirmation(request.command, request.apply_patch)
+        finally:
+            request.done.set()
+
+    def _put_message(self, msg_queue: queue.Queue, item, cancel_event: threading.Event):
+        """
+        Put an item on the message queue, giving up once the request is cancelled
+
+        Args:
+            msg_queue: Queue consumed by the terminal
+            item: Response chunk, confirmation request, exception or end sentinel
+            cancel_event: Event set when the terminal stops consuming
+        """
+        while not cancel_event.is_set():
+            try:
+                msg_queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _run_agent(self, user_message, stream: bool, msg_queue: queue.Queue, cancel_event: threading.Event):
+        """
+        Run the agent on the worker thread and push response chunks to the message queue
+
+        Args:
+            user_message: User message to send
+            stream: Whether to stream the response
+            msg_queue: Queue consumed by the terminal
+            cancel_event: Event set when the terminal cancels the request
+        """
+        self._worker_state.request = (msg_queue, cancel_event)
+        try:
+            response = self.agent.send_message(user_message, stream=stream)
+            if stream:
+                # Bind the per-chunk lookups to locals, this loop runs once per streamed token
+                is_cancelled = cancel_event.is_set
+                put_message = self._put_message
+                for chunk in response:
+                    if is_cancelled():
+                        # Stop the agent run instead of letting it go on in the background
+                        close = getattr(response, "close", None)
+                        if close is not None:
+                            close()
+                        break
+                    content = getattr(chunk, "content", None)
+                    if content:
+                        put_message(msg_queue, content, cancel_event)
+            elif response and response.content:
+                self._put_message(msg_queue, response.content, cancel_event)
+        except Exception as e:
+            # Only walk the traceback when debugging
+            if self.config.debug:
+                logger.exception("Error in send_message_to_agent:")
+            else:
+                logger.error("Error in send_message_to_agent: {}", e)
+            self._put_message(msg_queue, e, cancel_event)
+        finally:
+            self._put_message(msg_queue, _RESPONSE_END, cancel_event)
+
     def send_message_to_agent(self, user_message=None, stream=True):
         """
         Send a message to the agent and handle streaming response
-        
+
+        The agent runs on a background worker thread, response chunks and tool confirmations
+        are passed back through a bounded queue so the terminal stays responsive to Ctrl+C.
+        All terminal input, confirmation dialogs included, is read on the main thread.
+
         Args:
             user_message: Optional user message to send
             stream: Whether to stream the response
@@ -274,100 +576,86 @@ class TerminalChat:
         if user_message == self.initial_prompt:
             self.initial_image_paths = []
 
+        msg_queue = queue.Queue(maxsize=MESSAGE_QUEUE_SIZE)
+        cancel_event = threading.Event()
         try:
+            # The agent runs one request at a time, let a cancelled request wind down first
+            if self._worker is not None and self._worker.is_alive():
+                print("Waiting for the cancelled request to stop...")
+                self._worker.join()
+
             # Set loading state and start thinking indicator
             self.handle_loading_state(True)
 
-            # Get response from agent
-            response = self.agent.send_message(user_message, stream=stream)
-
-            if stream:
-                # Stream the response
-                has_content = False
-                first_chunk = True
+            # Get response from agent on a daemon worker thread, which cannot block interpreter exit
+            self._worker = threading.Thread(
+                target=self._run_agent, args=(user_message, stream, msg_queue, cancel_event), daemon=True
+            )
+            self._worker.start()
+
+            has_content = False
+            done = False
+            while not done:
+                item = msg_queue.get()
+                # Coalesce chunks arriving within the flush interval into a single write and flush,
+                # the first chunk and line ends are written right away
+                parts = []
+                errors = []
+                confirmation = None
+                deadline = time.monotonic() + STREAM_FLUSH_INTERVAL
+                while True:
+                    if item is _RESPONSE_END:
+                        done = True
+                        break
+                    if isinstance(item, Exception):
+                        errors.append(item)
+                        break
+                    if isinstance(item, _ConfirmationRequest):
+                        confirmation = item
+                        break
+                    parts.append(item)
+                    if self.loading or "\n" in item:
+                        break
+                    try:
+                        timeout = deadline - time.monotonic()
+                        item = msg_queue.get(timeout=timeout) if timeout > 0 else msg_queue.get_nowait()
+                    except queue.Empty:
+                        break
+
+                if (parts or errors) and self.loading:
+                    # First chunk received, clear thinking indicator
+                    self.handle_loading_state(False)
+                if parts:
+                    sys.stdout.write("".join(parts))
+                    sys.stdout.flush()
+                    has_content = True
+                for error in errors:
+                    print(f"\n{TermColor.RED}Error: {str(error)}{TermColor.RESET}")
+                if confirmation is not None:
+                    self._answer_confirmation(confirmation)
 
-                for chunk in response:
-                    if chunk and chunk.content:
-                        if first_chunk:
-                            # First chunk received, clear thinking indicator
-                            self.handle_loading_state(False)
-                            first_chunk = False
-                        print(chunk.content, end="", flush=True)
-                        has_content = True
-
-                # Print final newlines if we had content
-                if has_content:
-                    print("\n")  # Add an extra newline for spacing
-            else:
-                # Non-streaming response
+            if self.loading:
+                self.handle_loading_state(False)
+            # Print final newlines if we had content
+            if has_content:
+                print("\n")  # Add an extra newline for spacing
+        except KeyboardInterrupt:
+            cancel_event.set()
+            # Only clear the thinking indicator, not a line of streamed text
+            if self.loading:
+                self.handle_loading_state(False)
+            print("\n\nUser interrupted. Cancelling current request...")
+            self.agent.cancel()
+        finally:
+            # Release the worker however the terminal stopped consuming, it is done or gives up
+            cancel_event.set()
+            if self.loading:
                 self.handle_loading_state(False)
-                if response and response.content:
-                    print(response.content + "\n")  # Add an extra newline for spacing
-
-        except Exception as e:
-            self.handle_loading_state(False)
-            logger.exception("Error in send_message_to_agent:")
-            print(f"\n{TermColor.RED}Error: {str(e)}{TermColor.RESET}")
 
     def print_header(self):
         """Print the application header with version and model information"""
-        header_color = TermColor.BRIGHT_CYAN
-        accent_color = TermColor.BRIGHT_GREEN
-        reset = TermColor.RESET
-
-        # Create a boxed header
-        box_width = 60
-        border_top = f"{header_color}╭{'─' * (box_width - 1)}╮{reset}"
-        border_bottom = f"{header_color}╰{'─' * (box_width - 1)}╯{reset}"
-
-        # Print header
-        print(border_top)
-
-        # App name and version
-        app_name = f"{header_color}│{reset} {accent_color}Codev CLI{reset} - Interactive AI Coding Agent"
-        padding = box_width - len(app_name) + len(header_color) + len(reset) + len(accent_color) + len(reset)
-        print(f"{app_name}{' ' * padding}{header_color}│{reset}")
-
-        # Version info
-        version_line = f"{header_color}│{reset} Version: {CLI_VERSION}"
-        padding = box_width - len(version_line) + len(header_color) + len(reset)
-        print(f"{version_line}{' ' * padding}{header_color}│{reset}")
-
-        # Model info
-        model_info = f"{header_color}│{reset} Model: {accent_color}{self.config.model}{reset}"
-        padding = box_width - len(model_info) + len(header_color) + len(reset) + len(accent_color) + len(reset)
-        print(f"{model_info}{' ' * padding}{header_color}│{reset}")
-
-        # Approval policy info
-        policy_color = POLICY_COLORS.get(self.approval_policy, TermColor.WHITE)
-        policy_line = f"{header_color}│{reset} Approval Policy: {policy_color}{self.approval_policy}{reset}"
-        padding = box_width - len(policy_line) + len(header_color) + len(reset) + len(policy_color) + len(reset)
-        print(f"{policy_line}{' ' * padding}{header_color}│{reset}")
-
-        # Working directory
-        cwd_line = f"{header_color}│{reset} Working Directory: {short_cwd()}"
-        if len(cwd_line) - len(header_color) - len(reset) > box_width - 4:
-            # Truncate if too long
-            display_cwd = short_cwd()
-            max_cwd_len = box_width - 24  # Allow space for the label and ellipsis
-            if len(display_cwd) > max_cwd_len:
-                display_cwd = "..." + display_cwd[-(max_cwd_len - 3):]
-            cwd_line = f"{header_color}│{reset} Working Directory: {display_cwd}"
-        padding = box_width - len(cwd_line) + len(header_color) + len(reset)
-        print(f"{cwd_line}{' ' * padding}{header_color}│{reset}")
-
-        # Help info
-        help_line = f"{header_color}│{reset} Type {accent_color}/help{reset} for available commands"
-        padding = box_width - len(help_line) + len(header_color) + len(reset) + len(accent_color) + len(reset)
-        print(f"{help_line}{' ' * padding}{header_color}│{reset}")
-
-        # Input instructions
-        input_line = f"{header_color}│{reset} Input with {accent_color}>{reset} prompt, press {accent_color}Enter twice{reset} to submit"
-        padding = box_width - len(input_line) + len(header_color) + len(reset) + 2 * len(accent_color) + 2 * len(reset)
-        print(f"{input_line}{' ' * padding}{header_color}│{reset}")
-
-        print(border_bottom)
-        print()
+        sys.stdout.write(render_header(self.config.model, self.approval_policy, short_cwd()))
+        sys.stdout.flush()
 
     def process_initial_prompt(self):
         """Process the initial prompt if provided"""
@@ -377,7 +665,7 @@ class TerminalChat:
             # Handle images
             if self.initial_image_paths:
                 image_paths_str = ", ".join(self.initial_image_paths)
-                print(f"{colored_text('> ', 'bright_blue')}[Images attached: {image_paths_str}]")
+                print(f"{_LABEL_PROMPT}[Images attached: {image_paths_str}]")
                 if not content:
                     content = "[Please analyze these images]"
 
@@ -386,6 +674,8 @@ class TerminalChat:
 
     def run(self):
         """Run the terminal chat interface"""
+        # Stop the commands the agent started in the background when the chat exits
+        atexit.register(self.agent.shell_tool.terminate_background_processes)
         self.print_header()
 
         # Process initial prompt if provided
@@ -394,51 +684,49 @@ class TerminalChat:
         # Enable readline support (if available)
         chat_history_file = os.path.join(ROOT_DIR, "chat_history.log")
         os.makedirs(os.path.dirname(chat_history_file), exist_ok=True)
-        try:
-            # Set basic command auto-completion
-            def completer(text, state):
-                commands = ["/help", "/model", "/approval", "/history",
-                            "/clear", "/clearhistory", "/compact", "/exit", "/quit"]
-                options = [cmd for cmd in commands if cmd.startswith(text)]
-                if state < len(options):
-                    return options[state]
-                else:
-                    return None
+        if readline is not None:
+            self._readline = readline
 
             readline.parse_and_bind("tab: complete")
-            readline.set_completer(completer)
+            readline.set_completer(complete_command)
+            # Only submitted messages go to the history, not each line or confirmation answer
+            readline.set_auto_history(False)
 
             try:
                 readline.read_history_file(chat_history_file)
             except FileNotFoundError:
-                pass
+                # append_history_file needs an existing file
+                open(chat_history_file, 'a').close()
+            self._chat_history_file = chat_history_file
+            # Some libedit builds lack append_history_file, the whole file is rewritten there
+            self._append_history_supported = hasattr(readline, "append_history_file")
 
-        except ImportError:
+        else:
             logger.warning("readline module not available, some features will be limited")
 
         # Main input loop
         while not self.should_exit:
             try:
-                # If we're loading, show thinking indicator
-                if self.loading:
-                    self.show_thinking_indicator()
-                    continue
-
                 # Get user input
                 user_input = self.get_user_input()
                 if user_input is None:
                     continue
 
-                readline.add_history(user_input)
-                readline.write_history_file(chat_history_file)
+                if self._readline:
+                    self._readline.add_history(user_input)
 
-                # Handle special commands using the command handler
-                if user_input.startswith("/"):
-                    if self.command_handler.handle_command(user_input):
-                        continue
+                try:
+                    # Handle special commands using the command handler
+                    if user_input.startswith("/"):
+                        if self.command_handler.handle_command(user_input):
+                            continue
 
-                # Send message to the agent
-                self.send_message_to_agent(user_input)
+                    # Send message to the agent
+                    self.send_message_to_agent(user_input)
+                finally:
+                    # Save the history once the message is dispatched, a failed save must not drop it
+                    if self._readline:
+                        self._save_history()
             except KeyboardInterrupt:
                 print("\n\nUser interrupted.")
                 if self.loading:
@@ -449,10 +737,23 @@ class TerminalChat:
                     self.should_exit = True
             except Exception as e:
                 print(f"\n{TermColor.RED}Error: {str(e)}{TermColor.RESET}")
-                logger.exception("Terminal chat error:")
+                if self.config.debug:
+                    logger.exception("Terminal chat error:")
+                else:
+                    logger.error("Terminal chat error: {}", e)
 
         print("\nThank you for using Codev CLI. Goodbye!")
 
+    def _save_history(self):
+        """Save the last message to the readline history file, so closing the terminal loses nothing"""
+        try:
+            if self._append_history_supported:
+                self._readline.append_history_file(1, self._chat_history_file)
+            else:
+                self._readline.write_history_file(self._chat_history_file)
+        except Exception as e:
+            logger.warning("Failed to save chat history: {}", e)
+
     def get_user_input(self):
         """
         Get user input with support for multi-line editing.
@@ -461,57 +762,62 @@ class TerminalChat:
         Returns:
             User input string, or None if user wants to exit
         """
+        readline = self._readline
         try:
             # Set up readline to prevent backspacing over the prompt
             def pre_input(prompt):
-                readline.insert_text('')  # Ensure we're starting with empty input
-                readline.redisplay()
+                if readline:
+                    readline.insert_text('')  # Ensure we're starting with empty input
+                    readline.redisplay()
                 return prompt
-                
+
             # Store original get_line_buffer to restore later
-            original_get_line_buffer = readline.get_line_buffer
-            # Override get_line_buffer to prevent backspacing over prompt
-            readline.get_line_buffer = lambda: original_get_line_buffer() or ''
-            
-            # Get input lines until termination condition
-            lines = []
-            first_line = True
+            original_get_line_buffer = readline.get_line_buffer if readline else None
+            if readline:
+                # Override get_line_buffer to prevent backspacing over prompt
+                readline.get_line_buffer = lambda: original_get_line_buffer() or ''
+
+            # Ask again until the input is not empty
             while True:
-                try:
-                    if first_line:
-                        # For first line, use custom prompt handling
-                        line = input(pre_input("> "))
-                        first_line = False
-                    else:
-                        line = input()
-                    lines.append(line)
-                except EOFError:
-                    # Handle Ctrl+D
+                # Get input lines until termination condition
+                lines = []
+                first_line = True
+                while True:
+                    try:
+                        if first_line:
+                            # For first line, use custom prompt handling
+                            line = input(pre_input("> "))
+                            first_line = False
+                        else:
+                            line = input()
+                        lines.append(line)
+                    except EOFError:
+                        # Handle Ctrl+D
+                        print("\nExiting...")
+                        self.should_exit = True
+                        return None
+                    finally:
+                        # Restore original get_line_buffer
+                        if first_line and readline:
+                            readline.get_line_buffer = original_get_line_buffer
+                    if not line.strip():
+                        break
+                # If no valid input, return None
+                if not lines or not any(line.strip() for line in lines):
+                    print("Empty input, please try again.")
+                    continue
+
+                user_input = '\n'.join(lines)
+                user_input = user_input.strip()
+                # Check if user wants to exit
+                if user_input in EXIT_INPUTS:
                     print("\nExiting...")
                     self.should_exit = True
                     return None
-                finally:
-                    # Restore original get_line_buffer
-                    if first_line:
-                        readline.get_line_buffer = original_get_line_buffer
-                if not line.strip():
-                    break
-            # If no valid input, return None
-            if not lines or not any(line.strip() for line in lines):
-                print("Empty input, please try again.")
-                return self.get_user_input()
-
-            user_input = '\n'.join(lines)
-            user_input = user_input.strip()
-            # Check if user wants to exit
-            if user_input in ['\\q', 'exit', 'quit']:
-                print("\nExiting...")
-                self.should_exit = True
-                return None
 
-            # Save to history
-            self._save_to_input_history(user_input)
-            return user_input
+                # Save to history
+                self._save_to_input_history(user_input)
+                return user_input
         except KeyboardInterrupt:
             print("\nOperation interrupted.")
             if self.loading:
@@ -529,12 +835,9 @@ class TerminalChat:
         Args:
             user_input: User input to save
         """
-        # Avoid duplicates in history
+        # Avoid duplicates in history, deque(maxlen=50) keeps history size reasonable
         if not self._input_history or self._input_history[-1] != user_input:
             self._input_history.append(user_input)
-            # Keep history size reasonable
-            if len(self._input_history) > 50:
-                self._input_history = self._input_history[-50:]
 
     def update_approval_policy(self, new_policy: str):
         """
@@ -5,18 +5,243 @@
 """
 
 import os
+import mmap
+import itertools
+import shutil
+import signal
 import subprocess
 import time
+from collections import deque
+from typing import Deque, Iterable, List, Optional, Set
 from loguru import logger
 
+# Number of leading and trailing lines of command output shown to the user
+MAX_OUTPUT_LINES = 10
+# Number of leading and trailing lines of command output returned to the model
+MAX_RESULT_LINES = 1000
+# Seconds a foreground command may run before it is killed
+COMMAND_TIMEOUT = 300
+# Files of at least this many bytes are read through a memory map
+MMAP_READ_THRESHOLD = 64 * 1024
+
+
+# Flags for raw file writes, O_CLOEXEC/O_BINARY only exist on some platforms
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0)
+
+
+def _write_bytes(path: str, data: bytes) -> None:
+    """
+    Write bytes to a file with os.write, bypassing the text I/O layers
+
+    Args:
+        path: Path to the file
+        data: Encoded content
+    """
+    fd = os.open(path, _WRITE_FLAGS, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            # os.write may write fewer bytes than requested
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
+# Directories FileTool.write created or found, and the counter making temporary file names unique
+_KNOWN_DIRS: Set[str] = set()
+_TMP_COUNTER = itertools.count()
+
+
+def _atomic_write_bytes(path: str, data: bytes) -> None:
+    """
+    Write bytes to a file atomically, through a temporary file and os.replace
+
+    An interrupted write leaves the original file untouched instead of half written.
+
+    Args:
+        path: Path to the file
+        data: Encoded content
+    """
+    # Replace the link target rather than the link, and keep the mode of an existing file
+    target = os.path.realpath(path)
+    tmp_path = f"{target}.{os.getpid()}.{next(_TMP_COUNTER)}.tmp"
+    try:
+        _write_bytes(tmp_path, data)
+        try:
+            shutil.copymode(target, tmp_path)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# Buffer size of the output pipes, so large outputs are read in 64 KiB chunks instead of 8 KiB
+_PIPE_BUFFER_SIZE = 64 * 1024
+
+# Characters that need a shell to interpret a command string
+_SHELL_METACHARS = frozenset("|&;<>()$`\\\"'*?[]{}~=!#%\n")
+
+
+def _join_lines(head_lines: List[bytes], tail_lines: Iterable[bytes], omitted: int) -> str:
+    """
+    Decode command output lines, marking the omitted middle lines
+
+    Args:
+        head_lines: Leading output lines
+        tail_lines: Trailing output lines
+        omitted: Number of lines dropped between head and tail
+
+    Returns:
+        The decoded output
+    """
+    text = b"".join(head_lines).decode('utf-8', errors='replace')
+    if omitted:
+        text += f"... {omitted} more lines ...\n"
+    return text + b"".join(tail_lines).decode('utf-8', errors='replace')
+
+
+class _HeadTailLines:
+    """Leading and trailing lines of a stream, with the total number of lines"""
+
+    def __init__(self, max_lines: int):
+        """
+        Args:
+            max_lines: Number of leading and trailing lines to keep
+        """
+        self.max_lines = max_lines
+        self.head: List[bytes] = []
+        self.tail: Deque[bytes] = deque(maxlen=max_lines)
+        self.total = 0
+
+    def read(self, stream) -> None:
+        """
+        Read a binary stream line by line until EOF
+
+        Args:
+            stream: The stream to read
+        """
+        for line in stream:
+            self.total += 1
+            if len(self.head) < self.max_lines:
+                self.head.append(line)
+            else:
+                self.tail.append(line)
+
+
+def _popen(command, background: bool = False) -> subprocess.Popen:
+    """
+    Start a command with piped output
+
+    Simple command strings, without shell syntax and with an executable found on PATH, are
+    spawned directly instead of through /bin/sh, which lets CPython use os.posix_spawn.
+
+    Args:
+        command: Command string or argument list
+        background: Discard the output and detach the command into its own session, so it
+            neither blocks on a pipe nobody reads nor receives the terminal's Ctrl+C
+
+    Returns:
+        The started process
+    """
+    output = subprocess.DEVNULL if background else subprocess.PIPE
+    if isinstance(command, str) and _SHELL_METACHARS.isdisjoint(command):
+        args = command.split()
+        executable = shutil.which(args[0]) if args else None
+        if executable:
+            try:
+                return subprocess.Popen(
+                    args,
+                    executable=executable,
+                    close_fds=False,  # Inheritable fds are opt-in since Python 3.4, required for posix_spawn
+                    bufsize=_PIPE_BUFFER_SIZE,
+                    stdout=output,
+                    stderr=output,
+                    start_new_session=background
+                )
+            except OSError:
+                # e.g. a script without a shebang line, let the shell run it
+                pass
+    return subprocess.Popen(
+        command,
+        shell=True if isinstance(command, str) else False,
+        bufsize=_PIPE_BUFFER_SIZE,
+        stdout=output,
+        stderr=output,
+        start_new_session=background
+    )
+
 
 class ShellTool:
     """Custom shell tool for executing commands"""
 
-    def __init__(self):
-        """Initialize the shell tool"""
+    def __init__(self, max_output_lines: Optional[int] = MAX_OUTPUT_LINES, max_result_lines: int = MAX_RESULT_LINES):
+        """
+        Initialize the shell tool
+
+        Args:
+            max_output_lines: Number of leading and trailing output lines to show, None to show the full output
+            max_result_lines: Number of leading and trailing output lines kept for the model
+        """
         self.name = "shell"
         self.description = "Execute shell commands"
+        self.max_output_lines = max_output_lines
+        self.max_result_lines = max_result_lines
+        self._background_processes: List[subprocess.Popen] = []
+
+    def _format_output_for_display(self, head_lines: List[bytes], tail_lines: Deque[bytes], total_lines: int) -> str:
+        """
+        Keep only the head and tail of the command output for display
+
+        Args:
+            head_lines: Leading output lines
+            tail_lines: Trailing output lines
+            total_lines: Total number of output lines
+
+        Returns:
+            The output to display
+        """
+        n = self.max_output_lines
+        if n is None or total_lines <= 2 * n:
+            return _join_lines(head_lines, tail_lines, total_lines - len(head_lines) - len(tail_lines))
+        retained = list(tail_lines) if len(tail_lines) >= n else head_lines + list(tail_lines)
+        return _join_lines(head_lines[:n], retained[-n:], total_lines - 2 * n)
+
+    def _reap_background_processes(self):
+        """Forget background processes that have exited, poll() collects their exit status"""
+        self._background_processes = [p for p in self._background_processes if p.poll() is None]
+
+    def terminate_background_processes(self, timeout: float = 1.0):
+        """
+        Terminate the background processes that are still running
+
+        Args:
+            timeout: Seconds to wait for a process to exit before it is killed
+        """
+        self._reap_background_processes()
+        for process in self._background_processes:
+            try:
+                if os.name == "posix":
+                    # The process leads its own session, stop the whole group including its children
+                    os.killpg(process.pid, signal.SIGTERM)
+                else:
+                    process.terminate()
+                try:
+                    process.wait(timeout=timeout)
+                except subprocess.TimeoutExpired:
+                    if os.name == "posix":
+                        os.killpg(process.pid, signal.SIGKILL)
+                    else:
+                        process.kill()
+                    process.wait()
+            except OSError as e:
+                logger.debug("Failed to terminate background process {}: {}", process.pid, e)
+        self._background_processes = []
 
     def execute_command(self, command, is_background=False):
         """
@@ -30,61 +255,78 @@ class ShellTool:
             The command output
         """
         try:
-            logger.info(f"Executing command: `{command}`")
+            logger.info("Executing command: `{}`", command)
             # Execute the command
             if is_background:
-                # Run in background
-                process = subprocess.Popen(
-                    command,
-                    shell=True if isinstance(command, str) else False,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE
-                )
+                # Run in background, keeping the process so it can be reaped and terminated
+                self._reap_background_processes()
+                process = _popen(command, background=True)
+                self._background_processes.append(process)
                 result = f"Command running in background (PID: {process.pid})"
+                display = result
             else:
                 # Run with timeout
-                process = subprocess.Popen(
-                    command,
-                    shell=True if isinstance(command, str) else False,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE
-                )
+                process = _popen(command)
 
                 try:
                     import threading
-                    
-                    # Use a timeout mechanism
-                    def kill_process():
-                        if process.poll() is None:  # Process still running
-                            process.kill()
-                    
-                    # Start timer for timeout
-                    timer = threading.Timer(300, kill_process)
-                    timer.start()
-                    
-                    # Wait for process to complete
-                    stdout, stderr = process.communicate()
-                    
-                    # Cancel timer if process completed
-                    timer.cancel()
-                    
+
+                    # Drain stdout and stderr on helper threads, so a full pipe cannot block the
+                    # process and this thread is free to wait for it with a timeout
+                    stdout_lines = _HeadTailLines(self.max_result_lines)
+                    stderr_chunks = []
+                    readers = [
+                        threading.Thread(target=stdout_lines.read, args=(process.stdout,)),
+                        threading.Thread(target=lambda: stderr_chunks.append(process.stderr.read())),
+                    ]
+                    for reader in readers:
+                        reader.daemon = True
+                        reader.start()
+
+                    timed_out = False
+                    try:
+                        process.wait(timeout=COMMAND_TIMEOUT)
+                    except subprocess.TimeoutExpired:
+                        timed_out = True
+                        process.kill()
+                        process.wait()
+                    # A background child of a killed shell may keep the pipes open, then keep what was read
+                    join_deadline = time.monotonic() + 1 if timed_out else None
+                    for reader in readers:
+                        reader.join(None if join_deadline is None else max(0.0, join_deadline - time.monotonic()))
+
+                    head_lines = stdout_lines.head
+                    tail_lines = stdout_lines.tail
+                    total_lines = stdout_lines.total
                     exit_code = process.returncode
-                    stdout_text = stdout.decode('utf-8', errors='replace')
-                    stderr_text = stderr.decode('utf-8', errors='replace')
+                    stderr = b"".join(stderr_chunks)
 
-                    result = stdout_text
-                    if exit_code != 0 and stderr_text:
-                        result += f"\nError (code {exit_code}): {stderr_text}"
+                    result = _join_lines(head_lines, tail_lines, total_lines - len(head_lines) - len(tail_lines))
+                    display = self._format_output_for_display(head_lines, tail_lines, total_lines)
+                    # stderr is only reported for failed commands, decode it only then
+                    if exit_code != 0 and stderr:
+                        stderr_text = stderr.decode('utf-8', errors='replace')
+                        error_text = f"\nError (code {exit_code}): {stderr_text}"
+                        result += error_text
+                        display += error_text
+                    if timed_out:
+                        timeout_text = f"\nCommand timed out after {COMMAND_TIMEOUT} seconds and was killed"
+                        result += timeout_text
+                        display += timeout_text
                 except Exception as timeout_error:
                     try:
                         process.terminate()
-                        time.sleep(0.1)
-                        if process.poll() is None:
+                        try:
+                            # Returns as soon as the process exits
+                            process.wait(timeout=0.1)
+                        except subprocess.TimeoutExpired:
                             process.kill()
+                            process.wait()
                     except:
                         pass
                     result = "Command execution timed out or error occurred"
-            logger.info(f"Command output: \n```{result}```")
+                    display = result
+            logger.info("Command output: \n```{}```", display)
             return result
         except Exception as e:
             error_msg = f"Error executing command: {str(e)}"
@@ -111,9 +353,18 @@ class FileTool:
             The file content
         """
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            logger.info(f"Successfully read file: {path}")
+            size = os.path.getsize(path)
+            if size < MMAP_READ_THRESHOLD:
+                with open(path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            else:
+                # Decode straight from the mapped pages, without an intermediate bytes copy
+                with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    content = str(mm, 'utf-8')
+                # Translate newlines like text mode does
+                if '\r' in content:
+                    content = content.replace('\r\n', '\n').replace('\r', '\n')
+            logger.info("Successfully read file: {}", path)
             return content
         except Exception as e:
             error_msg = f"Error reading file: {str(e)}"
@@ -132,10 +383,21 @@ class FileTool:
             Success message
         """
         try:
-            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            logger.info(f"Successfully wrote to file: {path}")
+            # Only create a parent directory not seen before, repeated writes to a directory skip the syscalls
+            dir_name = os.path.dirname(path)
+            if dir_name and dir_name not in _KNOWN_DIRS:
+                os.makedirs(dir_name, exist_ok=True)
+                _KNOWN_DIRS.add(dir_name)
+            data = content.encode('utf-8')
+            try:
+                _atomic_write_bytes(path, data)
+            except FileNotFoundError:
+                if not dir_name:
+                    raise
+                # The directory was removed after it was cached
+                os.makedirs(dir_name, exist_ok=True)
+                _atomic_write_bytes(path, data)
+            logger.info("Successfully wrote to file: {}", path)
             return f"Successfully wrote to {path}"
         except Exception as e:
             error_msg = f"Error writing file: {str(e)}"
@@ -154,7 +416,7 @@ class FileTool:
         """
         try:
             os.remove(path)
-            logger.info(f"Successfully deleted file: {path}")
+            logger.info("Successfully deleted file: {}", path)
             return f"Successfully deleted {path}"
         except Exception as e:
             error_msg = f"Error deleting file: {str(e)}"
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+@author:XuMing(xuming624@qq.com)
+@description:
+"""
+import pytest
+
+pytest.importorskip("agentica")
+
+
+def test_agent_starts_without_api_key(monkeypatch):
+    from codev.agent import CodevAgent
+    from codev.config import AppConfig
+
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    model = CodevAgent(AppConfig(model="gpt-4o")).agent.model
+    # The OpenAI client is only built by the first request
+    assert model.client is None
+
+
+def test_model_clients(monkeypatch):
+    import httpx
+    from openai import AsyncOpenAI
+
+    import codev.models
+    from codev.agent import CodevAgent
+    from codev.config import AppConfig
+
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        return httpx.Response(200, json={"object": "list", "data": [{"id": "gpt-4o", "object": "model"}]})
+
+    pooled_client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(codev.models, "get_http_client", lambda: pooled_client)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    model = CodevAgent(AppConfig(model="gpt-4o")).agent.model
+
+    # Sync requests go over the shared pooled client, built once
+    client = model.get_client()
+    assert model.get_client() is client
+    assert [m.id for m in client.models.list()] == ["gpt-4o"]
+    assert requests and requests[-1].endswith("/models")
+
+    # Async runs (/compact) must not get the sync client
+    assert model.http_client is None
+    assert isinstance(model.get_async_client(), AsyncOpenAI)
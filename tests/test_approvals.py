@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+@author:XuMing(xuming624@qq.com)
+@description:
+"""
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from codev.approvals import read_choice
+
+CHOICES = frozenset(("a", "d", "e"))
+
+
+@pytest.fixture
+def type_keys(monkeypatch):
+    pty = pytest.importorskip("pty")
+    termios = pytest.importorskip("termios")
+    master, slave = pty.openpty()
+    stdin = os.fdopen(slave, "r")
+    monkeypatch.setattr(sys, "stdin", stdin)
+
+    def type_chunks(*chunks):
+        # Input typed before the prompt switches to cbreak mode is discarded, wait for it
+        while termios.tcgetattr(slave)[3] & termios.ICANON:
+            time.sleep(0.001)
+        for chunk in chunks:
+            os.write(master, chunk)
+            time.sleep(0.01)
+
+    def start(*chunks):
+        threading.Thread(target=type_chunks, args=chunks, daemon=True).start()
+
+    yield start
+    stdin.close()
+    os.close(master)
+
+
+def test_read_choice_ignores_escape_sequences(type_keys):
+    # Up (ends with A), Left (ends with D), Up in application mode and Alt+a come before the answer,
+    # the rest of a sequence may arrive in a separate read
+    type_keys(b"\x1b[A\x1b[D\x1bOA\x1bax\x1b[", b"1;5Ae")
+    assert read_choice("Your choice [a/d/e]: ", CHOICES) == "e"
+
+
+def test_read_choice_lowercases_plain_keys(type_keys):
+    type_keys(b"D")
+    assert read_choice("Your choice [a/d/e]: ", CHOICES) == "d"
+
+
+def test_read_choice_windows_keys(monkeypatch):
+    class Msvcrt:
+        def __init__(self, keys):
+            self.keys = list(keys)
+
+        def getwch(self):
+            return self.keys.pop(0)
+
+    monkeypatch.setattr(sys, "stdin", type("Tty", (), {"isatty": lambda self: True})())
+    # Left arrow is "\xe0K", its key code must not be taken as an answer
+    monkeypatch.setitem(sys.modules, "msvcrt", Msvcrt(["\xe0", "D", "\x00", "A", "a"]))
+    assert read_choice("Your choice [a/d/e]: ", CHOICES) == "a"
+
+    monkeypatch.setitem(sys.modules, "msvcrt", Msvcrt(["\x03"]))
+    with pytest.raises(KeyboardInterrupt):
+        read_choice("Your choice [a/d/e]: ", CHOICES)
@@ -3,24 +3,27 @@
 @author:XuMing(xuming624@qq.com)
 @description: 
 """
-import sys
-import unittest
+import pytest
 
-sys.path.append('..')
-from codev.format_command import format_command_for_display, parse_command
+from codev.format_command import parse_command, truncate_lines
 
 
-class IssueTestCase(unittest.TestCase):
+@pytest.mark.parametrize("prompt,expected", [
+    ("""ls
+        ll
+        'touch test.txt'
+        """, 3),
+    ("echo 'a b'", 2),
+    ('git commit -m "fix bug"', 4),
+    ("echo 'unterminated", 2),
+])
+def test_code_predict(prompt, expected):
+    assert len(parse_command(prompt)) == expected
 
-    def test_code_predict(self):
-        prompts = """ls
-            ll
-            'touch test.txt'
-            """
-        results = parse_command(prompts)
-        print(results)
-        self.assertEqual(len(results), 3)
 
-
-if __name__ == '__main__':
-    unittest.main()
+def test_truncate_lines():
+    text = "\n".join(str(i) for i in range(15))
+    head, dropped = truncate_lines(text, 10)
+    assert head == "\n".join(str(i) for i in range(10))
+    assert dropped == 5
+    assert truncate_lines("a\nb", 10) == ("a\nb", 0)
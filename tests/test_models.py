@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+@author:XuMing(xuming624@qq.com)
+@description:
+"""
+import json
+
+import pytest
+
+import codev.models
+from codev.models import _load_cached_models, _save_cached_models, get_available_models
+
+
+@pytest.fixture(autouse=True)
+def models_cache_file(tmp_path, monkeypatch):
+    cache_file = tmp_path / "models_cache.json"
+    monkeypatch.setattr(codev.models, "ROOT_DIR", str(tmp_path))
+    monkeypatch.setattr(codev.models, "MODELS_CACHE_FILE", str(cache_file))
+    return cache_file
+
+
+def test_models_cache_by_api_key():
+    _save_cached_models(["gpt-4o", "gpt-4o-mini"], "sk-a")
+    assert _load_cached_models("sk-a") == ["gpt-4o", "gpt-4o-mini"]
+    # Another key may see other models
+    assert _load_cached_models("sk-b") is None
+
+
+@pytest.mark.parametrize("content", ["[]", "null", "{}", "not json", '{"models": "gpt-4o"}'])
+def test_invalid_models_cache_is_a_miss(models_cache_file, monkeypatch, content):
+    models_cache_file.write_text(content)
+    assert _load_cached_models("sk-a") is None
+
+    # get_available_models falls back to the API
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-a")
+    monkeypatch.setattr(codev.models, "get_openai_client", _fake_openai_client)
+    assert get_available_models() == ["gpt-4o"]
+    assert json.loads(models_cache_file.read_text())["models"] == ["gpt-4o"]
+
+
+def _fake_openai_client(**client_params):
+    class Model:
+        id = "gpt-4o"
+
+    class Models:
+        def list(self):
+            return type("Page", (), {"data": [Model()]})()
+
+    return type("Client", (), {"models": Models()})()
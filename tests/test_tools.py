@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+@author:XuMing(xuming624@qq.com)
+@description:
+"""
+import io
+import os
+import stat
+import time
+
+import pytest
+
+import codev.tools
+from codev.tools import FileTool, ShellTool, _HeadTailLines, _popen
+
+posix_only = pytest.mark.skipif(os.name != "posix", reason="uses POSIX shell commands")
+
+
+@posix_only
+def test_execute_command_keeps_head_and_tail():
+    result = ShellTool().execute_command("seq 1 3000")
+    lines = result.splitlines()
+    assert len(lines) == 2001
+    assert lines[:2] == ["1", "2"]
+    assert lines[1000] == "... 1000 more lines ..."
+    assert lines[-2:] == ["2999", "3000"]
+
+
+def test_format_output_for_display():
+    stdout_lines = _HeadTailLines(1000)
+    stdout_lines.read(io.BytesIO(b"".join(b"%d\n" % i for i in range(1, 31))))
+    display = ShellTool(max_output_lines=10)._format_output_for_display(
+        stdout_lines.head, stdout_lines.tail, stdout_lines.total
+    )
+    expected = [str(i) for i in range(1, 11)] + ["... 10 more lines ..."] + [str(i) for i in range(21, 31)]
+    assert display.splitlines() == expected
+
+    # The full output is shown when max_output_lines is None
+    display = ShellTool(max_output_lines=None)._format_output_for_display(
+        stdout_lines.head, stdout_lines.tail, stdout_lines.total
+    )
+    assert display.splitlines() == [str(i) for i in range(1, 31)]
+
+
+@posix_only
+def test_execute_command_stderr_only_on_failure():
+    assert ShellTool().execute_command("echo out; echo warning >&2") == "out\n"
+
+    result = ShellTool().execute_command("echo out; echo failed >&2; exit 3")
+    assert result == "out\n\nError (code 3): failed\n"
+
+
+@posix_only
+def test_execute_command_timeout(monkeypatch):
+    monkeypatch.setattr(codev.tools, "COMMAND_TIMEOUT", 1)
+    start = time.monotonic()
+    result = ShellTool().execute_command("echo started; sleep 30")
+    assert time.monotonic() - start < 10
+    assert result.startswith("started\n")
+    assert result.endswith("Command timed out after 1 seconds and was killed")
+
+
+@posix_only
+def test_popen_direct_spawn_and_shell_fallback(tmp_path):
+    # Simple commands are spawned without a shell
+    process = _popen("echo hello")
+    assert process.communicate()[0] == b"hello\n"
+    assert process.args == ["echo", "hello"]
+
+    # Shell syntax goes through the shell
+    process = _popen("echo hello | tr a-z A-Z")
+    assert process.communicate()[0] == b"HELLO\n"
+    assert process.args == "echo hello | tr a-z A-Z"
+
+    # A script without a shebang line cannot be spawned directly, the shell runs it
+    script = tmp_path / "no_shebang"
+    script.write_text("echo from script\n")
+    script.chmod(0o755)
+    process = _popen(str(script))
+    assert process.communicate()[0] == b"from script\n"
+    assert process.args == str(script)
+
+
+@posix_only
+def test_write_keeps_mode_and_symlink(tmp_path):
+    target = tmp_path / "target.txt"
+    target.write_text("old")
+    target.chmod(0o600)
+    link = tmp_path / "link.txt"
+    link.symlink_to(target)
+
+    assert FileTool().write(str(link), "new") == f"Successfully wrote to {link}"
+    assert link.is_symlink()
+    assert target.read_text() == "new"
+    assert stat.S_IMODE(target.stat().st_mode) == 0o600
+    # No temporary file is left behind
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["link.txt", "target.txt"]